@@ -15,17 +15,37 @@ from torchvision.datasets import utils
 from torchvision.datasets import vision
 
 
-def get_mnist_loaders(batch_size, dynamically_binarize=False, resize_to_32=False):
+def get_mnist_loaders(
+    batch_size,
+    dynamically_binarize=False,
+    resize_to_32=False,
+    drop_last=False,
+    as_uint8=False,
+    pin_memory=False,
+    persistent_workers=False,
+):
     """Create train and test loaders for the MNIST dataset.
 
     Args:
         batch_size: The batch size to use.
         dynamically_binarize: Whether to dynamically  binarize images values to {0, 1}.
         resize_to_32: Whether to resize the images to 32x32.
+        drop_last: Whether to drop the last incomplete training batch, e.g. to keep
+            the training shapes static.
+        pin_memory: Whether the loaders should copy batches into pinned memory, e.g.
+            to speed up (asynchronous) host to device copies.
+        persistent_workers: Whether the loaders should keep their worker processes
+            alive across epochs.
+        as_uint8: Whether to return uint8 images in [0, 255] instead of float images
+            in [0, 1], e.g. to convert the images to float on the GPU. Cannot be used
+            with dynamically_binarize.
     Returns:
         Tuple of (train_loader, test_loader).
     """
-    transform = [transforms.ToTensor()]
+    assert not (
+        as_uint8 and dynamically_binarize
+    ), '"as_uint8" and "dynamically_binarize" cannot both be True.'
+    transform = [transforms.PILToTensor() if as_uint8 else transforms.ToTensor()]
     if dynamically_binarize:
         transform.append(lambda x: distributions.Bernoulli(probs=x).sample())
     if resize_to_32:
@@ -36,21 +56,38 @@ def get_mnist_loaders(batch_size, dynamically_binarize=False, resize_to_32=False
         batch_size=batch_size,
         shuffle=True,
         num_workers=8,
+        pin_memory=pin_memory,
+        persistent_workers=persistent_workers,
+        drop_last=drop_last,
     )
     test_loader = data.DataLoader(
         datasets.MNIST("/tmp/data", train=False, download=True, transform=transform),
         batch_size=batch_size,
         num_workers=8,
+        pin_memory=pin_memory,
+        persistent_workers=persistent_workers,
     )
     return train_loader, test_loader
 
 
-def get_cifar10_loaders(batch_size, normalize=False):
+def get_cifar10_loaders(
+    batch_size,
+    normalize=False,
+    drop_last=False,
+    pin_memory=False,
+    persistent_workers=False,
+):
     """Create train and test loaders for the CIFAR10 dataset.
 
     Args:
         batch_size: The batch size to use.
         normalize: Whether to normalize images to be zero mean, unit variance.
+        drop_last: Whether to drop the last incomplete training batch, e.g. to keep
+            the training shapes static.
+        pin_memory: Whether the loaders should copy batches into pinned memory, e.g.
+            to speed up (asynchronous) host to device copies.
+        persistent_workers: Whether the loaders should keep their worker processes
+            alive across epochs.
     Returns:
         Tuple of (train_loader, test_loader).
     """
@@ -65,11 +102,16 @@ def get_cifar10_loaders(batch_size, normalize=False):
         batch_size=batch_size,
         shuffle=True,
         num_workers=8,
+        pin_memory=pin_memory,
+        persistent_workers=persistent_workers,
+        drop_last=drop_last,
     )
     test_loader = data.DataLoader(
         datasets.CIFAR10("/tmp/data", train=False, download=True, transform=transform),
         batch_size=batch_size,
         num_workers=8,
+        pin_memory=pin_memory,
+        persistent_workers=persistent_workers,
     )
     return train_loader, test_loader
 
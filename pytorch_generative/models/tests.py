@@ -3,10 +3,17 @@
 import tempfile
 import unittest
 
+import PIL
+import numpy as np
 import torch
 from torch import distributions
+from torchvision import transforms
 
+from pytorch_generative import datasets
 from pytorch_generative import models
+from pytorch_generative import nn as pg_nn
+from pytorch_generative import trainer
+from pytorch_generative.models import vaes
 
 
 class DummyLoader:
@@ -123,3 +130,104 @@ class SmokeTests(unittest.TestCase):
             n_embedding_channels=4,
         )
         self._smoke_test(model)
+
+    def test_Decoder_forward_concat(self):
+        decoder = vaes.Decoder(
+            in_channels=5,
+            out_channels=3,
+            hidden_channels=4,
+            n_residual_blocks=1,
+            residual_channels=2,
+            stride=2,
+        )
+        a, b = torch.rand(2, 2, 4, 4), torch.rand(2, 3, 4, 4)
+        expected = decoder(torch.cat((a, b), dim=1))
+        self.assertTrue(
+            torch.allclose(decoder.forward_concat(a, b), expected, atol=1e-6)
+        )
+
+    def test_VectorQuantizer_autocast(self):
+        quantizer = pg_nn.VectorQuantizer(n_embeddings=4, embedding_dim=2)
+        x = torch.rand(2, 2, 3, 3, dtype=torch.bfloat16, requires_grad=True)
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            quantized, loss = quantizer(x)
+        self.assertEqual(quantized.dtype, torch.float32)
+        self.assertEqual(loss.dtype, torch.float32)
+        for buffer in quantizer.buffers():
+            self.assertEqual(buffer.dtype, torch.float32)
+
+        (quantized.sum() + loss).backward()
+        self.assertEqual(x.grad.dtype, torch.bfloat16)
+
+    def test_VQVAE2_autocast(self):
+        model = models.VQVAE2(
+            in_channels=3,
+            out_channels=3,
+            hidden_channels=4,
+            n_residual_blocks=1,
+            residual_channels=2,
+            n_embeddings=4,
+            embedding_dim=2,
+        )
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            preds, vq_loss = model(torch.rand(2, 3, 8, 8))
+        self.assertEqual(preds.dtype, torch.bfloat16)
+        self.assertEqual(vq_loss.dtype, torch.float32)
+        for buffer in model.buffers():
+            self.assertEqual(buffer.dtype, torch.float32)
+        (preds.float().mean() + vq_loss).backward()
+
+    def test_Trainer_autocast(self):
+        model = models.TinyCNN()
+        dtypes = []
+
+        def loss_fn(x, _, preds):
+            dtypes.append(preds.dtype)
+            return (preds.float() - x).pow(2).mean()
+
+        with tempfile.TemporaryDirectory() as log_dir:
+            model_trainer = trainer.Trainer(
+                model=model,
+                loss_fn=loss_fn,
+                optimizer=torch.optim.Adam(model.parameters()),
+                train_loader=DummyLoader(1, 5),
+                eval_loader=DummyLoader(1, 5),
+                log_dir=log_dir,
+                autocast_dtype=torch.bfloat16,
+            )
+            model_trainer.interleaved_train_and_eval(n_epochs=1)
+        # Both the training and the evaluation forward passes use autocast.
+        self.assertEqual(dtypes, [torch.bfloat16, torch.bfloat16])
+        for param in model.parameters():
+            self.assertEqual(param.dtype, torch.float32)
+
+    def test_uint8_images_to_float(self):
+        image = np.zeros((4, 4, 3), dtype=np.uint8)
+        image[0, 0] = 255
+        x = transforms.PILToTensor()(PIL.Image.fromarray(image, mode="RGB"))
+        x = x.unsqueeze(0)
+        self.assertEqual(x.dtype, torch.uint8)
+
+        model = models.TinyCNN(in_channels=3, out_channels=3)
+        with tempfile.TemporaryDirectory() as log_dir:
+            model_trainer = trainer.Trainer(
+                model=model,
+                loss_fn=None,
+                optimizer=torch.optim.Adam(model.parameters()),
+                train_loader=None,
+                eval_loader=None,
+                log_dir=log_dir,
+                memory_format=torch.channels_last,
+                preprocess_fn=lambda x: x.div(255),
+            )
+            x, _ = model_trainer._to_device(x, None)
+        self.assertEqual(x.dtype, torch.float32)
+        self.assertEqual(x.min().item(), 0.0)
+        self.assertEqual(x.max().item(), 1.0)
+        self.assertTrue(x.is_contiguous(memory_format=torch.channels_last))
+
+    def test_mnist_uint8_and_dynamically_binarize(self):
+        with self.assertRaises(AssertionError):
+            datasets.get_mnist_loaders(
+                batch_size=1, dynamically_binarize=True, as_uint8=True
+            )
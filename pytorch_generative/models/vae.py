@@ -7,6 +7,25 @@ from pytorch_generative.models import base
 from pytorch_generative.models import vaes
 
 
+def _reparameterize_and_kl(encoded, noise):
+    """Samples latents and computes their KL divergence.
+
+    Args:
+        encoded: The encoder output, i.e. the mean and log variance of the latent
+            Gaussian concatenated along the channel dimension.
+        noise: Standard normal noise with the same shape as the mean.
+    Returns:
+        Tuple of (latents, kl_div).
+    """
+    mean, log_var = encoded.chunk(2, dim=1)
+    std = torch.exp(0.5 * log_var)
+    latents = mean + std * noise
+    # NOTE: This KL divergence is only applicable under the assumption that the
+    # prior ~ N(0, 1) and the latents are Gaussian.
+    kl_div = -0.5 * (1 + log_var - mean * mean - std * std).mean(dim=(1, 2, 3))
+    return latents, kl_div
+
+
 class VAE(base.GenerativeModel):
     """The Variational Autoencoder model."""
 
@@ -52,12 +71,9 @@ class VAE(base.GenerativeModel):
     def forward(self, x):
         # NOTE: We use log_var (instead of var or std) for stability and easier
         # optimization during training.
-        mean, log_var = torch.split(self._encoder(x), self._latent_channels, dim=1)
-        var = torch.exp(log_var)
-        latents = mean + torch.sqrt(var) * torch.randn_like(var)
-        # NOTE: This KL divergence is only applicable under the assumption that the
-        # prior ~ N(0, 1) and the latents are Gaussian.
-        kl_div = -0.5 * (1 + log_var - mean ** 2 - var).mean(dim=(1, 2, 3))
+        encoded = self._encoder(x)
+        noise = torch.randn_like(encoded[:, : self._latent_channels])
+        latents, kl_div = _reparameterize_and_kl(encoded, noise)
         return self._decoder(latents), kl_div
 
     def sample(self, n_samples):
@@ -93,9 +109,31 @@ def reproduce(
     from pytorch_generative import models
     from pytorch_generative import trainer
 
+    device_type = torch.device(device).type
+    if device_type == "cuda":
+        torch.backends.cudnn.benchmark = True
+        torch.set_float32_matmul_precision("high")
     train_loader, test_loader = debug_loader, debug_loader
+    compile_mode = None
+    preprocess_fn = None
     if train_loader is None:
-        train_loader, test_loader = datasets.get_mnist_loaders(batch_size)
+        train_loader, test_loader = datasets.get_mnist_loaders(
+            batch_size,
+            drop_last=True,
+            as_uint8=True,
+            pin_memory=device_type == "cuda",
+            persistent_workers=True,
+        )
+        # NOTE: Since the last incomplete batch is dropped, the training shapes are
+        # static and the compiled model can be replayed with CUDA Graphs.
+        if device_type == "cuda":
+            compile_mode = "reduce-overhead"
+
+        # NOTE: The uint8 images are converted to float on the device since this is
+        # much cheaper than converting each image in the DataLoader workers and it
+        # reduces the host to device transfer size by 4x.
+        def preprocess_fn(x):
+            return x.div(255)
 
     model = models.VAE(
         in_channels=1,
@@ -109,13 +147,14 @@ def reproduce(
 
     def loss_fn(x, _, preds):
         preds, vae_loss = preds
-        recon_loss = F.binary_cross_entropy_with_logits(preds, x, reduction="none")
-        recon_loss = recon_loss.mean(dim=(1, 2, 3))
-        loss = recon_loss + vae_loss
+        # NOTE: Since every example has the same number of pixels, averaging the
+        # per example losses is the same as averaging over the whole batch.
+        recon_loss = F.binary_cross_entropy_with_logits(preds, x)
+        vae_loss = vae_loss.mean()
         return {
-            "recon_loss": recon_loss.mean(),
-            "vae_loss": vae_loss.mean(),
-            "loss": loss.mean(),
+            "recon_loss": recon_loss,
+            "vae_loss": vae_loss,
+            "loss": recon_loss + vae_loss,
         }
 
     def sample_fn(model):
@@ -132,5 +171,9 @@ def reproduce(
         sample_fn=sample_fn,
         log_dir=log_dir,
         device=device,
+        memory_format=torch.channels_last,
+        autocast_dtype=torch.bfloat16 if device_type == "cuda" else None,
+        preprocess_fn=preprocess_fn,
+        compile_mode=compile_mode,
     )
     model_trainer.interleaved_train_and_eval(n_epochs)
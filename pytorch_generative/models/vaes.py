@@ -1,6 +1,10 @@
 """Common modules used by Variational Autoencoders."""
 
+import itertools
+
+import torch
 from torch import nn
+from torch.nn import functional as F
 
 from pytorch_generative import nn as pg_nn
 
@@ -179,6 +183,24 @@ class Decoder(nn.Module):
     def forward(self, x):
         return self._net(x)
 
+    def forward_concat(self, *xs):
+        """Equivalent to `forward(torch.cat(xs, dim=1))`.
+
+        Since conv(cat(a, b)) == conv(a, w_a) + conv(b, w_b) when w_a and w_b split
+        the conv weight along its input channels, the first conv is computed on each
+        input separately and the concatenated Tensor is never materialized.
+        """
+        conv = self._net[0]
+        weights = torch.split(conv.weight, [x.shape[1] for x in xs], dim=1)
+        out = None
+        for x, weight in zip(xs, weights):
+            bias = conv.bias if out is None else None
+            y = F.conv2d(x, weight, bias, conv.stride, conv.padding, conv.dilation)
+            out = y if out is None else out.add_(y)
+        for layer in itertools.islice(self._net, 1, None):
+            out = layer(out)
+        return out
+
 
 class Quantizer(nn.Module):
     """Wraps a VectorQuantizer to handle input with arbitrary channels."""
@@ -89,16 +89,46 @@ class VQVAE2(base.GenerativeModel):
             residual_channels=residual_channels,
             stride=2,
         )
+        # NOTE: The stream is created lazily since the model may be constructed on a
+        # machine without CUDA.
+        self._stream_t = None
+
+    def _quantize(self, encoded_t, encoded_b):
+        """Quantizes the top and bottom encodings.
+
+        On CUDA, the (independent) top quantizer runs on a side stream so that its
+        kernels can overlap with the bottom quantizer's kernels. When compiling, the
+        quantizers are run serially and the scheduling is left to the compiler.
+        """
+        if not encoded_t.is_cuda or torch.compiler.is_compiling():
+            return self._quantizer_t(encoded_t), self._quantizer_b(encoded_b)
+
+        if self._stream_t is None or self._stream_t.device != encoded_t.device:
+            self._stream_t = torch.cuda.Stream(device=encoded_t.device)
+        stream = torch.cuda.current_stream(encoded_t.device)
+        self._stream_t.wait_stream(stream)
+        with torch.cuda.stream(self._stream_t):
+            quantized_t, vq_loss_t = self._quantizer_t(encoded_t)
+        quantized_b, vq_loss_b = self._quantizer_b(encoded_b)
+        stream.wait_stream(self._stream_t)
+
+        # NOTE: Tensors used across streams must be recorded so that the caching
+        # allocator does not reuse their memory while the other stream needs them.
+        encoded_t.record_stream(self._stream_t)
+        quantized_t.record_stream(stream)
+        vq_loss_t.record_stream(stream)
+        return (quantized_t, vq_loss_t), (quantized_b, vq_loss_b)
 
     def forward(self, x):
         encoded_b = self._encoder_b(x)
         encoded_t = self._encoder_t(encoded_b)
 
-        quantized_t, vq_loss_t = self._quantizer_t(encoded_t)
-        quantized_b, vq_loss_b = self._quantizer_b(encoded_b)
+        (quantized_t, vq_loss_t), (quantized_b, vq_loss_b) = self._quantize(
+            encoded_t, encoded_b
+        )
 
         decoded_t = self._decoder_t(quantized_t)
-        xhat = self._decoder_b(torch.cat((self._conv(decoded_t), quantized_b), dim=1))
+        xhat = self._decoder_b.forward_concat(self._conv(decoded_t), quantized_b)
         return xhat, 0.5 * (vq_loss_b + vq_loss_t) + F.mse_loss(decoded_t, encoded_b)
 
     def sample(self, n_samples):
@@ -130,11 +160,32 @@ def reproduce(
     from pytorch_generative import models
     from pytorch_generative import trainer
 
+    device_type = torch.device(device).type
+    if device_type == "cuda":
+        torch.backends.cudnn.benchmark = True
+        torch.set_float32_matmul_precision("high")
     train_loader, test_loader = debug_loader, debug_loader
+    compile_mode = None
+    preprocess_fn = None
     if train_loader is None:
         train_loader, test_loader = datasets.get_cifar10_loaders(
-            batch_size, normalize=True
+            batch_size,
+            drop_last=True,
+            pin_memory=device_type == "cuda",
+            persistent_workers=True,
         )
+        # NOTE: Since the last incomplete batch is dropped, the training shapes are
+        # static and the compiled model can be replayed with CUDA Graphs.
+        if device_type == "cuda":
+            compile_mode = "reduce-overhead"
+
+        # NOTE: We normalize the whole batch on the device instead of normalizing
+        # each image in the DataLoader workers.
+        mean = torch.tensor((0.4914, 0.4822, 0.4465), device=device).view(1, 3, 1, 1)
+        std = torch.tensor((0.2023, 0.1994, 0.2010), device=device).view(1, 3, 1, 1)
+
+        def preprocess_fn(x):
+            return x.sub(mean).div_(std)
 
     model = models.VQVAE2(
         in_channels=3,
@@ -168,5 +219,9 @@ def reproduce(
         lr_scheduler=scheduler,
         log_dir=log_dir,
         device=device,
+        memory_format=torch.channels_last,
+        autocast_dtype=torch.bfloat16 if device_type == "cuda" else None,
+        preprocess_fn=preprocess_fn,
+        compile_mode=compile_mode,
     )
     model_trainer.interleaved_train_and_eval(n_epochs)
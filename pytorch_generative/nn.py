@@ -362,6 +362,12 @@ class VectorQuantizer(nn.Module):
             self._embedding = nn.Parameter(embedding)
 
     def forward(self, x):
+        # NOTE: We always quantize in FP32 since reduced precision changes the
+        # nearest embedding assignments and degrades the EMA statistics.
+        with torch.autocast(x.device.type, enabled=False):
+            return self._quantize(x.float())
+
+    def _quantize(self, x):
         n, c, h, w = x.shape
         assert c == self.embedding_dim, "Input channels must equal embedding_dim."
 
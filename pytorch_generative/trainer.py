@@ -1,6 +1,7 @@
 """Utilities to train PyTorch models with less boilerplate."""
 
 import collections
+import contextlib
 import os
 import tempfile
 import time
@@ -33,6 +34,10 @@ class Trainer:
         log_dir=None,
         save_checkpoint_epochs=1,
         device="cpu",
+        memory_format=torch.preserve_format,
+        autocast_dtype=None,
+        preprocess_fn=None,
+        compile_mode=None,
     ):
         """Initializes a new Trainer instance.
 
@@ -61,9 +66,21 @@ class Trainer:
                 that this does not affect TensorBoard logging frequency.
             device: The device to place the model and data. Either string or
                 torch.device.
+            memory_format: The torch.memory_format to use for the model's (4D)
+                parameters and the input data, e.g. `torch.channels_last`.
+            autocast_dtype: If not `None`, the forward pass and loss computation are
+                run under `torch.autocast` with this dtype, e.g. `torch.bfloat16`. No
+                loss scaling is performed, so prefer `torch.bfloat16` (which has the
+                same range as `torch.float32`) over `torch.float16`.
+            preprocess_fn: A `fn(inputs)->inputs` which is applied to every input batch
+                after it is moved to `device`, e.g. to normalize the batch on the GPU.
+            compile_mode: If not `None`, the model is compiled in place with this
+                `torch.compile` mode, e.g. "reduce-overhead" to also replay the kernels
+                with CUDA Graphs. The compiled model is specialized to static shapes,
+                so every training batch should have the same shape.
         """
         # Stateful objects that need to be saved.
-        self._model = model.to(device)
+        self._model = model.to(device, memory_format=memory_format)
         self._optimizer = optimizer
         self._lr_scheduler = lr_scheduler
 
@@ -75,6 +92,13 @@ class Trainer:
         self._log_dir = log_dir or tempfile.mkdtemp()
         self._save_checkpoint_epochs = save_checkpoint_epochs
         self._device = torch.device(device) if isinstance(device, str) else device
+        self._memory_format = memory_format
+        self._autocast_dtype = autocast_dtype
+        self._preprocess_fn = preprocess_fn
+        if compile_mode is not None:
+            # NOTE: Module.compile() (instead of torch.compile()) compiles in place so
+            # the state_dict keys are unchanged.
+            self._model.compile(mode=compile_mode, dynamic=False, fullgraph=True)
 
         self._sample_epochs = sample_epochs
         self._sample_fn = sample_fn
@@ -128,6 +152,19 @@ class Trainer:
             self._log_dir, max_queue=100, purge_step=self._step
         )
 
+    def _autocast(self):
+        if self._autocast_dtype is None:
+            return contextlib.nullcontext()
+        return torch.autocast(self._device.type, dtype=self._autocast_dtype)
+
+    def _to_device(self, x, y):
+        x = x.to(self._device, non_blocking=True, memory_format=self._memory_format)
+        if self._preprocess_fn is not None:
+            x = self._preprocess_fn(x)
+        if y is not None:
+            y = y.to(self._device, non_blocking=True)
+        return x, y
+
     def _get_loss_dict(self, loss):
         loss = loss if isinstance(loss, dict) else {"loss": loss}
         assert "loss" in loss, 'Losses dictionary does not contain "loss" key.'
@@ -153,11 +190,10 @@ class Trainer:
 
     def _train_one_batch(self, x, y):
         self._model.train()
-        x = x.to(self._device)
-        if y is not None:
-            y = y.to(self._device)
+        x, y = self._to_device(x, y)
         self._optimizer.zero_grad()
-        loss = self._get_loss_dict(self.train_one_batch(x, y))
+        with self._autocast():
+            loss = self._get_loss_dict(self.train_one_batch(x, y))
         loss["loss"].backward()
 
         norm = 0
@@ -184,10 +220,9 @@ class Trainer:
     def _eval_one_batch(self, x, y):
         with torch.no_grad():
             self._model.eval()
-            x = x.to(self._device)
-            if y is not None:
-                y = y.to(self._device)
-            loss = self._get_loss_dict(self.eval_one_batch(x, y))
+            x, y = self._to_device(x, y)
+            with self._autocast():
+                loss = self._get_loss_dict(self.eval_one_batch(x, y))
             return {k: v.item() for k, v in loss.items()}
 
     def interleaved_train_and_eval(self, n_epochs):